@@ -10,6 +10,8 @@ This backend provides APIs for:
 - Downloading segmentation results
 """
 
+import asyncio
+import io
 import os
 import json
 import logging
@@ -18,8 +20,10 @@ import shutil
 import uuid
 import threading
 import time
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, NamedTuple, Optional, Set, Tuple
 from pathlib import Path
 
 # Configure logging FIRST before any other imports that might log
@@ -30,22 +34,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+import aiofiles
 import uvicorn
 import numpy as np
 import nibabel as nib
 import torch
-from fastapi import FastAPI, HTTPException, UploadFile, File, Header, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header, Depends, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from huggingface_hub import snapshot_download
+from PIL import Image
 
 # DICOM support
 import zipfile
 import pydicom
 from pydicom.errors import InvalidDicomError
 
+# Try to import numba for JIT-compiled hot loops
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError as e:
+    NUMBA_AVAILABLE = False
+    logger.warning(f"numba not available, falling back to NumPy kernels: {e}")
+
+# Try to use SIMD-accelerated zlib (isal) for the .nii.gz writes nibabel
+# produces - roughly 3x the compression throughput of stdlib gzip
+try:
+    from isal import igzip
+    from nibabel.openers import Opener as _NibOpener
+    # The second element is the opener's keyword-argument names, matching
+    # the shape of the stock ('mode', 'compresslevel', ...) entry
+    _NibOpener.compress_ext_map['.gz'] = (igzip.IGzipFile, ('mode', 'compresslevel', 'mtime'))
+    ISAL_AVAILABLE = True
+except (ImportError, AttributeError, KeyError) as e:
+    ISAL_AVAILABLE = False
+    logger.warning(f"isal not available, using stdlib gzip for NIfTI output: {e}")
+
+# Try to import skimage for the one-call seeded watershed mock path
+try:
+    from skimage.segmentation import watershed
+    SKIMAGE_AVAILABLE = True
+except ImportError as e:
+    SKIMAGE_AVAILABLE = False
+    logger.warning(f"skimage not available, mock segmentation will use region growing: {e}")
+
 # Try to import nnInteractive
 try:
     from nnInteractive.inference.inference_session import nnInteractiveInferenceSession
@@ -79,7 +114,14 @@ class Point2DWithNumber(BaseModel):
 
 class Point3D(BaseModel):
     z: int
-    y: int 
+    y: int
+    x: int
+
+# Internal 3D point: sessions store thousands of these, so use a NamedTuple
+# (no validation, no __dict__) and only build Point3D at the API boundary
+class _P3(NamedTuple):
+    z: int
+    y: int
     x: int
 
 class MarkPointRequest(BaseModel):
@@ -88,11 +130,16 @@ class MarkPointRequest(BaseModel):
     point: Point2D
     point_number: Optional[int] = None  # Optional specific point number
 
+class BatchPointEntry(MarkPointRequest):
+    session_id: str  # batch entries span sessions, so the header can't carry it
+
+class MarkPointsBatchRequest(BaseModel):
+    points: List[BatchPointEntry]
+
 class RunSegmentationRequest(BaseModel):
     points_3d: List[Point3D]
 
 class SliceResponse(BaseModel):
-    slice_data: List[List[int]]  # 2D array as nested lists
     axis: int
     slice_index: int
     max_slices: int
@@ -114,10 +161,13 @@ class SessionInfo(BaseModel):
 
 # FastAPI app with increased limits for large NIfTI files
 app = FastAPI(
-    title="Interactive 3D Segmentation API", 
+    title="Interactive 3D Segmentation API",
     version="1.0.0",
     # Increase default limits for large medical files
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    # orjson serializes nested dict/list responses several times faster than
+    # stdlib json and without intermediate str allocations
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for frontend - allow all origins for development
@@ -127,75 +177,115 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Max-Slices", "X-Marked-Points"],
 )
 
+# Color template for labels - shared across all sessions. Stored as a
+# (34, 3) uint8 lookup table so color assignment is a single array index
+# (and can be vectorized over many points at once).
+_COLOR_LUT = np.array([
+    [255, 0, 0], [0, 255, 0], [0, 0, 255], [255, 255, 0],
+    [0, 255, 255], [255, 0, 255], [255, 239, 213], [255, 170, 0],
+    [172, 0, 129], [0, 166, 0], [169, 102, 205], [0, 0, 128],
+    [0, 203, 203], [94, 117, 29], [255, 43, 192], [106, 90, 205],
+    [221, 166, 169], [122, 202, 233], [165, 91, 42], [150, 185, 100],
+    [219, 112, 214], [218, 217, 112], [215, 64, 235], [255, 182, 193],
+    [60, 179, 113], [182, 158, 255], [255, 228, 196], [218, 165, 32],
+    [0, 128, 128], [188, 143, 143], [255, 105, 180], [255, 218, 185],
+    [222, 184, 135], [127, 255, 0],
+], dtype=np.uint8)
+_LABELS = [f'#{i}' for i in range(1, 33)] + ['Bridge', 'Implant']
+
+# Dict form used by the color template API and the label file writer
+COLOR_TEMPLATE = [
+    {'idx': i + 1, 'r': int(r), 'g': int(g), 'b': int(b), 'label': label}
+    for i, ((r, g, b), label) in enumerate(zip(_COLOR_LUT, _LABELS))
+]
+
 # Session-based state management
 class SessionState:
     def __init__(self, session_id: str):
         self.session_id = session_id
+        # Guards point-state mutations; reads of other sessions never contend
+        self.lock = threading.RLock()
         self.created_at = datetime.now()
-        self.last_activity = datetime.now()
+        # Monotonic activity stamp: touched on every request, so it must be a
+        # single cheap float store rather than a datetime construction
+        self._touched_mono = time.monotonic()
         self.nifti_data: Optional[np.ndarray] = None
+        self.file_uploaded: bool = False
+        # Volume stats captured once at upload so status polls never rescan
+        self.nifti_min: Optional[float] = None
+        self.nifti_max: Optional[float] = None
+        self.nifti_shape: Optional[Tuple[int, ...]] = None
+        # Lazily built float32 copy for nnInteractive; invalidated with the volume
+        self.nifti_data_f32: Optional[np.ndarray] = None
+        # Reusable segmentation output buffers (numpy for mock, torch for
+        # nnInteractive) - zeroed per run instead of reallocated
+        self.mock_seg_buffer: Optional[np.ndarray] = None
+        self.nn_combined_buffer = None
         self.nifti_affine: Optional[np.ndarray] = None
         self.nifti_header = None
         self.nifti_file_path: Optional[str] = None
-        self.marked_points_2d: Dict[Tuple[int, int], List[Point2DWithNumber]] = {}
-        self.all_3d_points: List[Point3D] = []
+        # Persistent upload directory, created on first upload and reused
+        # (wiped, not recreated) for each subsequent one
+        self.upload_dir: Optional[str] = None
+        # Persistent output directory: runs overwrite fixed filenames in here
+        self.output_dir: Optional[str] = None
+        self.axis_views: Dict[int, np.ndarray] = {}
+        self._scratch: Dict[Tuple[str, Tuple[int, ...]], np.ndarray] = {}
+        self._scratch_lock = threading.Lock()
+        # Small LRU of encoded slice PNGs keyed by (axis, slice_index), so
+        # scrubbing back and forth (and prefetched neighbours) skips re-encoding
+        self.slice_cache: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        self._slice_cache_lock = threading.Lock()
+        # Bumped on every clear_data so a prefetch worker that finishes
+        # encoding the old volume after an upload can't insert a stale PNG
+        self.data_generation: int = 0
+        # Marked points per slice, keyed by point number for O(1) add/remove,
+        # plus a reverse index so removal only touches the slices involved
+        self.points_by_slice: Dict[Tuple[int, int], Dict[int, Point2DWithNumber]] = defaultdict(dict)
+        self.number_to_slices: Dict[int, Set[Tuple[int, int]]] = defaultdict(set)
+        # 3D points keyed by (z, y, x), with number <-> tuple maintained in
+        # both directions so lookups in either direction are O(1)
+        self.all_3d_points: Dict[Tuple[int, int, int], _P3] = {}
         self.point_counter: int = 0
         self.point_to_number: Dict[Tuple[int, int, int], int] = {}
+        self.number_to_point_tuple: Dict[int, Tuple[int, int, int]] = {}
         self.last_marked_number: int = 0  # Track the chronologically last marked point number
         self.session: Optional[object] = None
         self.output_files: List[str] = []
+        # stat results captured when output files are written, so downloads
+        # skip the per-request os.stat
+        self.output_stats: Dict[str, os.stat_result] = {}
         
         # View state tracking
         self.current_axis: int = 2  # Default to axial view
         self.current_slice: int = 0  # Default to first slice
-        
-        # Color template for labels
-        self.color_template = [
-            {'idx': 1, 'r': 255, 'g': 0, 'b': 0, 'label': '#1'},
-            {'idx': 2, 'r': 0, 'g': 255, 'b': 0, 'label': '#2'},
-            {'idx': 3, 'r': 0, 'g': 0, 'b': 255, 'label': '#3'},
-            {'idx': 4, 'r': 255, 'g': 255, 'b': 0, 'label': '#4'},
-            {'idx': 5, 'r': 0, 'g': 255, 'b': 255, 'label': '#5'},
-            {'idx': 6, 'r': 255, 'g': 0, 'b': 255, 'label': '#6'},
-            {'idx': 7, 'r': 255, 'g': 239, 'b': 213, 'label': '#7'},
-            {'idx': 8, 'r': 255, 'g': 170, 'b': 0, 'label': '#8'},
-            {'idx': 9, 'r': 172, 'g': 0, 'b': 129, 'label': '#9'},
-            {'idx': 10, 'r': 0, 'g': 166, 'b': 0, 'label': '#10'},
-            {'idx': 11, 'r': 169, 'g': 102, 'b': 205, 'label': '#11'},
-            {'idx': 12, 'r': 0, 'g': 0, 'b': 128, 'label': '#12'},
-            {'idx': 13, 'r': 0, 'g': 203, 'b': 203, 'label': '#13'},
-            {'idx': 14, 'r': 94, 'g': 117, 'b': 29, 'label': '#14'},
-            {'idx': 15, 'r': 255, 'g': 43, 'b': 192, 'label': '#15'},
-            {'idx': 16, 'r': 106, 'g': 90, 'b': 205, 'label': '#16'},
-            {'idx': 17, 'r': 221, 'g': 166, 'b': 169, 'label': '#17'},
-            {'idx': 18, 'r': 122, 'g': 202, 'b': 233, 'label': '#18'},
-            {'idx': 19, 'r': 165, 'g': 91, 'b': 42, 'label': '#19'},
-            {'idx': 20, 'r': 150, 'g': 185, 'b': 100, 'label': '#20'},
-            {'idx': 21, 'r': 219, 'g': 112, 'b': 214, 'label': '#21'},
-            {'idx': 22, 'r': 218, 'g': 217, 'b': 112, 'label': '#22'},
-            {'idx': 23, 'r': 215, 'g': 64, 'b': 235, 'label': '#23'},
-            {'idx': 24, 'r': 255, 'g': 182, 'b': 193, 'label': '#24'},
-            {'idx': 25, 'r': 60, 'g': 179, 'b': 113, 'label': '#25'},
-            {'idx': 26, 'r': 182, 'g': 158, 'b': 255, 'label': '#26'},
-            {'idx': 27, 'r': 255, 'g': 228, 'b': 196, 'label': '#27'},
-            {'idx': 28, 'r': 218, 'g': 165, 'b': 32, 'label': '#28'},
-            {'idx': 29, 'r': 0, 'g': 128, 'b': 128, 'label': '#29'},
-            {'idx': 30, 'r': 188, 'g': 143, 'b': 143, 'label': '#30'},
-            {'idx': 31, 'r': 255, 'g': 105, 'b': 180, 'label': '#31'},
-            {'idx': 32, 'r': 255, 'g': 218, 'b': 185, 'label': '#32'},
-            {'idx': 33, 'r': 222, 'g': 184, 'b': 135, 'label': 'Bridge'},
-            {'idx': 34, 'r': 127, 'g': 255, 'b': 0, 'label': 'Implant'},
-        ]
 
     def update_activity(self):
-        """Update last activity timestamp"""
-        self.last_activity = datetime.now()
+        """Update the activity stamp - one atomic float store"""
+        self._touched_mono = time.monotonic()
+
+    @property
+    def last_activity(self) -> datetime:
+        """Wall-clock view of the monotonic activity stamp, built on demand"""
+        return datetime.now() - timedelta(seconds=time.monotonic() - self._touched_mono)
+
+    def idle_seconds(self) -> float:
+        """Seconds since the session was last touched"""
+        return time.monotonic() - self._touched_mono
 
     def clear_data(self):
         """Clear segmentation data but keep session alive"""
         self.nifti_data = None
+        self.file_uploaded = False
+        self.nifti_min = None
+        self.nifti_max = None
+        self.nifti_shape = None
+        self.nifti_data_f32 = None
+        self.mock_seg_buffer = None
+        self.nn_combined_buffer = None
         self.nifti_affine = None
         self.nifti_header = None
         if self.nifti_file_path and os.path.exists(self.nifti_file_path):
@@ -204,10 +294,18 @@ class SessionState:
             except:
                 pass
         self.nifti_file_path = None
-        self.marked_points_2d.clear()
+        self.axis_views = {}
+        with self._scratch_lock:
+            self._scratch.clear()
+        with self._slice_cache_lock:
+            self.slice_cache.clear()
+            self.data_generation += 1
+        self.points_by_slice.clear()
+        self.number_to_slices.clear()
         self.all_3d_points.clear()
         self.point_counter = 0
         self.point_to_number.clear()
+        self.number_to_point_tuple.clear()
         self.last_marked_number = 0  # Reset last marked number
         self.session = None
         
@@ -223,12 +321,102 @@ class SessionState:
             except:
                 pass
         self.output_files.clear()
+        self.output_stats.clear()
+
+    def add_point_marking(self, slice_key: Tuple[int, int], point: Point2DWithNumber):
+        """Record a marked point on a slice - O(1) dict insert"""
+        self.points_by_slice[slice_key][point.point_number] = point
+        self.number_to_slices[point.point_number].add(slice_key)
+
+    def remove_point_markings(self, point_number: int):
+        """Drop a point number from every slice it is marked on"""
+        for slice_key in self.number_to_slices.pop(point_number, set()):
+            slice_points = self.points_by_slice.get(slice_key)
+            if slice_points is not None:
+                slice_points.pop(point_number, None)
+                if not slice_points:
+                    del self.points_by_slice[slice_key]
+
+    def get_scratch(self, kind: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Borrow a reusable scratch buffer keyed by (kind, shape).
+
+        The slice shape is constant per session, so one buffer per
+        (kind, shape) covers nearly every /api/slice call without allocating.
+        """
+        key = (kind, shape)
+        with self._scratch_lock:
+            buf = self._scratch.get(key)
+            if buf is None:
+                buf = np.empty(shape, dtype)
+                self._scratch[key] = buf
+            return buf
+
+    def reset_upload_dir(self) -> str:
+        """Return the session's upload directory, emptied of any previous upload"""
+        if self.upload_dir is None or not os.path.isdir(self.upload_dir):
+            self.upload_dir = tempfile.mkdtemp(prefix=f"seg_upload_{self.session_id[:8]}_")
+        else:
+            for entry in os.listdir(self.upload_dir):
+                path = os.path.join(self.upload_dir, entry)
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                except OSError:
+                    pass
+        return self.upload_dir
+
+    def destroy_upload_dir(self):
+        """Remove the upload directory entirely (session teardown)"""
+        if self.upload_dir:
+            shutil.rmtree(self.upload_dir, ignore_errors=True)
+            self.upload_dir = None
+
+    def get_output_dir(self) -> str:
+        """Return the session's persistent segmentation output directory"""
+        if self.output_dir is None or not os.path.isdir(self.output_dir):
+            self.output_dir = tempfile.mkdtemp(prefix=f"seg_out_{self.session_id[:8]}_")
+        return self.output_dir
+
+    def destroy_output_dir(self):
+        """Remove the output directory entirely (session teardown)"""
+        if self.output_dir:
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+            self.output_dir = None
+
+    SLICE_CACHE_SIZE = 16
+
+    def get_cached_slice(self, axis: int, slice_index: int) -> Optional[bytes]:
+        """Return the cached PNG for a slice, refreshing its LRU position"""
+        key = (axis, slice_index)
+        with self._slice_cache_lock:
+            png = self.slice_cache.get(key)
+            if png is not None:
+                self.slice_cache.move_to_end(key)
+            return png
+
+    def cache_slice(self, axis: int, slice_index: int, png_bytes: bytes,
+                    generation: Optional[int] = None):
+        """Insert an encoded slice PNG, evicting the least recently used entry.
+
+        Callers that read the volume outside the lock pass the generation
+        they encoded from; if clear_data ran in between, the insert is
+        dropped rather than caching a PNG of the previous volume.
+        """
+        with self._slice_cache_lock:
+            if generation is not None and generation != self.data_generation:
+                return
+            self.slice_cache[(axis, slice_index)] = png_bytes
+            self.slice_cache.move_to_end((axis, slice_index))
+            while len(self.slice_cache) > self.SLICE_CACHE_SIZE:
+                self.slice_cache.popitem(last=False)
 
     def get_point_color(self, point_number: int) -> Dict[str, int]:
         """Get RGB color for a point based on its number"""
-        if point_number <= len(self.color_template):
-            color = self.color_template[point_number - 1]
-            return {'r': color['r'], 'g': color['g'], 'b': color['b']}
+        if point_number <= len(_COLOR_LUT):
+            r, g, b = _COLOR_LUT[point_number - 1]
+            return {'r': int(r), 'g': int(g), 'b': int(b)}
         else:
             # Default color for points beyond template
             return {'r': 255, 'g': 255, 'b': 255}
@@ -238,32 +426,49 @@ class SessionState:
         return self.last_marked_number + 1
 
 class SessionManager:
+    # Sweep for expired sessions once per this many creations
+    SWEEP_EVERY = 16
+
     def __init__(self, session_timeout_hours: int = 24):
         self.sessions: Dict[str, SessionState] = {}
-        self.session_timeout = timedelta(hours=session_timeout_hours)
+        self.timeout_seconds = session_timeout_hours * 3600.0
         self.lock = threading.RLock()
-        
-        # Start cleanup thread
-        self.cleanup_thread = threading.Thread(target=self._cleanup_expired_sessions, daemon=True)
-        self.cleanup_thread.start()
-    
+        self._creations_since_sweep = 0
+
     def create_session(self) -> str:
         """Create a new session and return session ID"""
         with self.lock:
+            # Piggyback idle-session eviction on creation instead of running
+            # an always-on background thread
+            self._creations_since_sweep += 1
+            if self._creations_since_sweep >= self.SWEEP_EVERY:
+                self._creations_since_sweep = 0
+                self._sweep_expired()
+
             session_id = str(uuid.uuid4())
             self.sessions[session_id] = SessionState(session_id)
             logger.info(f"Created new session: {session_id}")
             return session_id
     
     def get_session(self, session_id: str) -> SessionState:
-        """Get session by ID, raise HTTPException if not found"""
-        with self.lock:
-            if session_id not in self.sessions:
-                raise HTTPException(status_code=404, detail="Session not found")
-            
-            session = self.sessions[session_id]
-            session.update_activity()
-            return session
+        """Get session by ID, raise HTTPException if not found.
+
+        Lock-free read: single-key dict gets are atomic under the GIL, so the
+        global lock is only needed for insertion and deletion. This keeps
+        concurrent slice/mark requests on different sessions from serializing
+        through one lock.
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        # Lazy expiry: sessions die the moment anyone touches them stale
+        if session.idle_seconds() > self.timeout_seconds:
+            self.delete_session(session_id)
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        session.update_activity()
+        return session
     
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
@@ -271,6 +476,8 @@ class SessionManager:
             if session_id in self.sessions:
                 session = self.sessions[session_id]
                 session.clear_data()
+                session.destroy_upload_dir()
+                session.destroy_output_dir()
                 del self.sessions[session_id]
                 logger.info(f"Deleted session: {session_id}")
                 return True
@@ -291,32 +498,29 @@ class SessionManager:
                 for session in self.sessions.values()
             ]
     
-    def _cleanup_expired_sessions(self):
-        """Background thread to clean up expired sessions"""
-        while True:
-            try:
-                current_time = datetime.now()
-                expired_sessions = []
-                
-                with self.lock:
-                    for session_id, session in self.sessions.items():
-                        if current_time - session.last_activity > self.session_timeout:
-                            expired_sessions.append(session_id)
-                
-                for session_id in expired_sessions:
-                    self.delete_session(session_id)
-                    logger.info(f"Cleaned up expired session: {session_id}")
-                
-                # Sleep for 1 hour before next cleanup
-                time.sleep(3600)
-                
-            except Exception as e:
-                logger.error(f"Error in session cleanup: {e}")
-                time.sleep(3600)
+    def _sweep_expired(self):
+        """Evict all expired sessions. Caller must hold the lock."""
+        expired_sessions = [
+            session_id for session_id, session in self.sessions.items()
+            if session.idle_seconds() > self.timeout_seconds
+        ]
+        for session_id in expired_sessions:
+            self.delete_session(session_id)
+            logger.info(f"Cleaned up expired session: {session_id}")
 
 # Global session manager
 session_manager = SessionManager()
 
+@app.on_event("startup")
+async def start_session_sweeper():
+    """Sweep expired sessions periodically on the event loop"""
+    async def sweep_loop():
+        while True:
+            await asyncio.sleep(900)
+            with session_manager.lock:
+                session_manager._sweep_expired()
+    asyncio.create_task(sweep_loop())
+
 # Dependency to get session
 def get_session_id(x_session_id: Optional[str] = Header(None)) -> str:
     """Get session ID from header, validate it exists"""
@@ -338,35 +542,197 @@ def get_session(session_id: str = Depends(get_session_id)) -> SessionState:
         raise
 
 # Utility functions
-def normalize_slice_for_display(slice_data: np.ndarray) -> np.ndarray:
-    """Normalize slice data for display (0-255)"""
-    if slice_data.max() > slice_data.min():
-        normalized = ((slice_data - slice_data.min()) / 
-                     (slice_data.max() - slice_data.min()) * 255).astype(np.uint8)
-    else:
-        normalized = np.zeros_like(slice_data, dtype=np.uint8)
-    return normalized
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _norm_u8(src, dst):
+        """Fused min/max scan + linear remap to uint8, parallel over rows"""
+        lo = src.min()
+        hi = src.max()
+        s = 255.0 / (hi - lo) if hi > lo else 0.0
+        for i in prange(src.shape[0]):
+            for j in range(src.shape[1]):
+                dst[i, j] = np.uint8((src[i, j] - lo) * s)
+
+    # 6-connected neighborhood offsets for the region-growing kernel
+    _NEIGH = np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0],
+                       [0, -1, 0], [0, 0, 1], [0, 0, -1]], dtype=np.int32)
+
+    @njit(cache=True)
+    def _region_grow_multi(vol, seg, avail, seeds, hu_los, hu_hi, labels, queue, budget):
+        """Bounded multi-source 6-connected region grow (Adams-Bischof style).
+
+        Every seed is enqueued up front on one shared FIFO frontier, so the
+        seeds expand in interleaved breadth-first rounds and the first seed
+        to reach a voxel wins it. Adjacent seeds inside a single connected
+        above-threshold component therefore split it at roughly equidistant
+        boundaries instead of the first seed claiming the whole component.
+        `hu_los` carries one lower intensity bound per seed; `budget` caps
+        the voxels painted per seed. Availability is tracked in `avail`, a
+        packed 1-bit-per-voxel bitmap: 8x smaller than re-reading the label
+        volume, so it stays cache resident across nearby seeds. `queue` is a
+        preallocated (n_seeds * budget, 4) work array of (z, y, x, seed).
+        Returns the total number of voxels painted.
+        """
+        ny_dim = vol.shape[1]
+        nx_dim = vol.shape[2]
+        head = 0
+        tail = 0
+        cap = queue.shape[0]
+        painted = np.zeros(seeds.shape[0], dtype=np.int64)
+        total = 0
+        for s in range(seeds.shape[0]):
+            z = seeds[s, 0]
+            y = seeds[s, 1]
+            x = seeds[s, 2]
+            lin = (z * ny_dim + y) * nx_dim + x
+            if (avail[lin >> 3] & (1 << (lin & 7))) == 0:
+                continue
+            if vol[z, y, x] < hu_los[s] or vol[z, y, x] > hu_hi:
+                continue
+            seg[z, y, x] = np.uint8(labels[s])
+            avail[lin >> 3] ^= np.uint8(1 << (lin & 7))
+            painted[s] = 1
+            total += 1
+            queue[tail, 0] = z
+            queue[tail, 1] = y
+            queue[tail, 2] = x
+            queue[tail, 3] = s
+            tail += 1
+        while head < tail:
+            cz = queue[head, 0]
+            cy = queue[head, 1]
+            cx = queue[head, 2]
+            s = queue[head, 3]
+            head += 1
+            if painted[s] >= budget:
+                continue
+            for i in range(6):
+                nz = cz + _NEIGH[i, 0]
+                ny = cy + _NEIGH[i, 1]
+                nx = cx + _NEIGH[i, 2]
+                if (nz < 0 or ny < 0 or nx < 0 or
+                        nz >= vol.shape[0] or ny >= ny_dim or nx >= nx_dim):
+                    continue
+                lin = (nz * ny_dim + ny) * nx_dim + nx
+                if (avail[lin >> 3] & (1 << (lin & 7))) == 0:
+                    continue
+                if vol[nz, ny, nx] < hu_los[s] or vol[nz, ny, nx] > hu_hi:
+                    continue
+                seg[nz, ny, nx] = np.uint8(labels[s])
+                avail[lin >> 3] ^= np.uint8(1 << (lin & 7))
+                painted[s] += 1
+                total += 1
+                if tail < cap:
+                    queue[tail, 0] = nz
+                    queue[tail, 1] = ny
+                    queue[tail, 2] = nx
+                    queue[tail, 3] = s
+                    tail += 1
+                if painted[s] >= budget:
+                    break
+        return total
+
+    # Warm up the JITs at import so the first slice/segmentation request
+    # doesn't pay the compile cost (volumes are stored as int16)
+    _norm_u8(np.zeros((2, 2), dtype=np.int16), np.empty((2, 2), dtype=np.uint8))
+    _region_grow_multi(np.zeros((2, 2, 2), dtype=np.int16), np.zeros((2, 2, 2), dtype=np.uint8),
+                       np.full(1, 0xFF, dtype=np.uint8),
+                       np.zeros((1, 3), dtype=np.int32), np.zeros(1), 0.0,
+                       np.ones(1, dtype=np.int64), np.empty((8, 4), dtype=np.int32), 8)
+
+def normalize_slice_for_display(slice_data: np.ndarray, buf_f32: Optional[np.ndarray] = None,
+                                out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Normalize slice data for display (0-255).
+
+    Fused into a single pass with preallocatable scratch buffers: the naive
+    `(x - min) / (max - min) * 255` form walks the slice three times and
+    allocates two float64 temporaries before the uint8 cast. When numba is
+    available the whole thing runs as one parallel JIT kernel instead.
+    """
+    if NUMBA_AVAILABLE:
+        if out is None or out.shape != slice_data.shape:
+            out = np.empty(slice_data.shape, dtype=np.uint8)
+        _norm_u8(slice_data, out)
+        return out
+
+    lo = slice_data.min()
+    rng = slice_data.max() - lo
+    if rng == 0:
+        return np.zeros(slice_data.shape, dtype=np.uint8)
+
+    if buf_f32 is None or buf_f32.shape != slice_data.shape:
+        buf_f32 = np.empty(slice_data.shape, dtype=np.float32)
+    if out is None or out.shape != slice_data.shape:
+        out = np.empty(slice_data.shape, dtype=np.uint8)
+
+    scale = np.float32(255.0 / rng)
+    np.subtract(slice_data, lo, out=buf_f32, dtype=np.float32)
+    np.multiply(buf_f32, scale, out=buf_f32)
+    np.clip(buf_f32, 0, 255, out=buf_f32)
+    out[...] = buf_f32
+    return out
+
+def encode_slice_png(normalized_slice: np.ndarray) -> bytes:
+    """Encode a normalized uint8 slice as PNG bytes (low compression, fast encode)"""
+    buf = io.BytesIO()
+    Image.fromarray(normalized_slice).save(buf, 'PNG', compress_level=1)
+    return buf.getvalue()
+
+def load_volume_as_int16(nii) -> np.ndarray:
+    """Load NIfTI voxel data as int16 instead of float64.
+
+    get_fdata() always materializes float64 (8 bytes/voxel) even though CT
+    data is natively int16. Preserving the integer dtype cuts resident memory
+    4x and halves the bandwidth of every downstream slice read and min/max.
+    """
+    data = np.asanyarray(nii.dataobj)
+    if data.dtype == np.int16:
+        return data
+    if np.issubdtype(data.dtype, np.integer):
+        info = np.iinfo(np.int16)
+        return np.clip(data, info.min, info.max).astype(np.int16)
+    # Scaled (slope/intercept) data comes back as float - round and saturate
+    info = np.iinfo(np.int16)
+    return np.clip(np.rint(data), info.min, info.max).astype(np.int16)
+
+# Transpose orders that bring each viewing axis to the front
+_AXIS_TRANSPOSE = {
+    0: (0, 1, 2),   # Sagittal
+    1: (1, 0, 2),   # Coronal
+    2: (2, 0, 1),   # Axial
+}
+
+def build_axis_view(data: np.ndarray, axis: int) -> np.ndarray:
+    """Build a contiguous stack for one axis so its slices are flat sequential reads.
+
+    Slicing the raw volume along axis 1 or 2 walks strided memory; re-laying
+    the volume out per axis makes every slice request a contiguous copy. For
+    axis 0 on an already-contiguous (or memory-mapped) volume this is a no-op.
+    """
+    return np.ascontiguousarray(data.transpose(_AXIS_TRANSPOSE[axis]))
 
 def get_slice_data(session: SessionState, axis: int, slice_index: int) -> np.ndarray:
     """Extract slice data from 3D volume"""
     if session.nifti_data is None:
         raise HTTPException(status_code=400, detail="No NIfTI file loaded")
-    
-    if axis == 0:  # Sagittal
-        return session.nifti_data[slice_index, :, :]
-    elif axis == 1:  # Coronal
-        return session.nifti_data[:, slice_index, :]
-    else:  # axis == 2, Axial
-        return session.nifti_data[:, :, slice_index]
-
-def convert_2d_to_3d_coordinates(point_2d: Point2D, axis: int, slice_index: int) -> Point3D:
-    """Convert 2D point to 3D coordinates"""
-    if axis == 0:  # Sagittal
-        return Point3D(z=slice_index, y=point_2d.y, x=point_2d.x)
-    elif axis == 1:  # Coronal
-        return Point3D(z=point_2d.y, y=slice_index, x=point_2d.x)
-    else:  # axis == 2, Axial
-        return Point3D(z=point_2d.y, y=point_2d.x, x=slice_index)
+
+    view = session.axis_views.get(axis)
+    if view is None:
+        # Built lazily on first use of each axis so upload stays cheap and
+        # axes the user never views are never materialized
+        view = build_axis_view(session.nifti_data, axis)
+        session.axis_views[axis] = view
+    return view[slice_index]
+
+# Which of (slice_index, y, x) lands in each of (z, y, x), per viewing axis:
+# rows are sagittal/coronal/axial. A bulk path can reuse these as fancy indices.
+_AXIS_PERMS = ((0, 1, 2), (1, 0, 2), (1, 2, 0))
+
+def convert_2d_to_3d_coordinates(point_2d: Point2D, axis: int, slice_index: int) -> _P3:
+    """Convert 2D point to 3D coordinates via the per-axis permutation table"""
+    vals = (slice_index, point_2d.y, point_2d.x)
+    pz, py, px = _AXIS_PERMS[axis]
+    return _P3(z=vals[pz], y=vals[py], x=vals[px])
 
 # API Routes
 
@@ -390,6 +756,79 @@ async def list_sessions():
     """List all active sessions"""
     return {"sessions": session_manager.get_all_sessions()}
 
+def _load_nifti_volume(path: str) -> Tuple[np.ndarray, np.ndarray, object]:
+    """Load a NIfTI file into (data, affine, header). Blocking - run off the event loop.
+
+    Memory-mapped: for uncompressed, unscaled files the returned array stays
+    an np.memmap, so voxels page in as they are touched instead of being read
+    up front, and the OS page cache serves repeated slice requests.
+    """
+    nii = nib.load(path, mmap=True)
+    return load_volume_as_int16(nii), nii.affine, nii.header
+
+def _read_dicom_header(path: str):
+    """Read one DICOM header (no pixel data), returning None if invalid"""
+    try:
+        return pydicom.dcmread(path, stop_before_pixels=True)
+    except Exception as e:
+        logger.warning(f"Invalid DICOM file {path}: {e}")
+        return None
+
+def _load_dicom_series(dicom_files: List[str]) -> np.ndarray:
+    """Read, sort and stack a DICOM series into an int16 volume.
+
+    Blocking - run off the event loop. Two passes: headers only
+    (stop_before_pixels) to determine slice order and volume shape, then
+    pixel decode in sorted order straight into a preallocated volume. This
+    avoids holding N full Dataset objects plus the doubled copy of np.stack,
+    and the reads are spread across a thread pool since pydicom's pixel
+    decode releases the GIL in NumPy.
+    """
+    max_workers = min(8, len(dicom_files))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        heads = [(f, ds) for f, ds in zip(dicom_files, pool.map(_read_dicom_header, dicom_files))
+                 if ds is not None]
+    if not heads:
+        raise HTTPException(status_code=400, detail="No valid DICOM slices found.")
+    try:
+        heads.sort(key=lambda t: int(getattr(t[1], 'InstanceNumber', 0)))
+    except Exception:
+        try:
+            heads.sort(key=lambda t: float(getattr(t[1], 'SliceLocation', 0.0)))
+        except Exception:
+            pass
+
+    rows = int(heads[0][1].Rows)
+    cols = int(heads[0][1].Columns)
+    volume = np.empty((len(heads), rows, cols), dtype=np.int16)
+
+    def _fill_slice(args):
+        """Decode one slice into the volume; returns its index on failure"""
+        i, path = args
+        try:
+            pixels = pydicom.dcmread(path).pixel_array
+        except Exception as e:
+            logger.warning(f"Failed to decode DICOM pixels {path}: {e}")
+            return i
+        if pixels.dtype != np.int16:
+            # Saturate before the narrowing assignment - uint16 stored
+            # values past 32767 would otherwise wrap negative
+            info = np.iinfo(np.int16)
+            pixels = np.clip(pixels, info.min, info.max)
+        volume[i] = pixels
+        return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        failed = [i for i in pool.map(_fill_slice, enumerate(f for f, _ in heads))
+                  if i is not None]
+    if failed:
+        # Drop slices whose pixel decode failed, mirroring how bad headers
+        # are skipped in pass 1 (the copy only happens on this error path)
+        volume = np.delete(volume, failed, axis=0)
+        if volume.shape[0] == 0:
+            raise HTTPException(status_code=400, detail="No valid DICOM slices found.")
+    return volume
+
 @app.post("/api/upload")
 async def upload_nifti(file: UploadFile = File(...), session: SessionState = Depends(get_session)):
     """Upload and load a NIfTI file with fresh session state"""
@@ -409,122 +848,84 @@ async def upload_nifti(file: UploadFile = File(...), session: SessionState = Dep
         logging.info(f"Uploading file: {file.filename} ({file_size / (1024*1024):.1f} MB) for session {session.session_id}")
         session.clear_data()
         session.update_activity()
-        temp_dir = tempfile.mkdtemp()
+        # Reuse one directory per session rather than leaking a fresh mkdtemp
+        # (and its inode churn) on every upload
+        temp_dir = session.reset_upload_dir()
         temp_file_path = os.path.join(temp_dir, file.filename)
 
-        with open(temp_file_path, "wb") as buffer:
-            while chunk := await file.read(8192):
-                buffer.write(chunk)
+        # Stream to disk in 1 MiB chunks without blocking the event loop
+        async with aiofiles.open(temp_file_path, "wb") as buffer:
+            while chunk := await file.read(1 << 20):
+                await buffer.write(chunk)
         logging.info(f"File saved to: {temp_file_path}")
 
+        loop = asyncio.get_running_loop()
+
         if is_nifti:
             try:
-                nii = nib.load(temp_file_path)
-                session.nifti_data = nii.get_fdata()
-                session.nifti_affine = nii.affine
-                session.nifti_header = nii.header
+                data, affine, header = await loop.run_in_executor(
+                    None, _load_nifti_volume, temp_file_path)
+                session.nifti_data = data
+                session.nifti_affine = affine
+                session.nifti_header = header
                 session.nifti_file_path = temp_file_path
-                logger.info(f"Loaded NIfTI file: {file.filename} for session {session.session_id}")
-                logger.info(f"Shape: {session.nifti_data.shape}")
-                logger.info(f"Range: {session.nifti_data.min():.2f} to {session.nifti_data.max():.2f}")
+                session.file_uploaded = True
+                # Scan the volume once and reuse the result for both the log
+                # line and the response instead of four full-volume passes
+                dmin, dmax = float(data.min()), float(data.max())
+                session.nifti_min, session.nifti_max = dmin, dmax
+                session.nifti_shape = tuple(data.shape)
+                logger.info("Loaded NIfTI file: %s for session %s", file.filename, session.session_id)
+                logger.info("Shape: %s", data.shape)
+                logger.info("Range: %.2f to %.2f", dmin, dmax)
                 return {
                     "message": "File uploaded successfully",
                     "session_id": session.session_id,
-                    "shape": list(session.nifti_data.shape),
-                    "data_range": [float(session.nifti_data.min()), float(session.nifti_data.max())],
+                    "shape": list(data.shape),
+                    "data_range": [dmin, dmax],
                     "file_type": "nifti"
                 }
             except Exception as e:
                 logger.error(f"Failed to load NIfTI file: {e}")
                 raise HTTPException(status_code=400, detail=f"Failed to load NIfTI file: {str(e)}")
 
-        elif is_dicom_zip:
-            dicom_dir = os.path.join(temp_dir, "dicom_series")
-            os.makedirs(dicom_dir, exist_ok=True)
-            with zipfile.ZipFile(temp_file_path, 'r') as zip_ref:
-                zip_ref.extractall(dicom_dir)
-            dicom_files = [os.path.join(dicom_dir, f) for f in os.listdir(dicom_dir) if f.lower().endswith('.dcm')]
-            if not dicom_files:
-                raise HTTPException(status_code=400, detail="No DICOM files found in uploaded zip.")
-            slices = []
-            for f in dicom_files:
-                try:
-                    ds = pydicom.dcmread(f)
-                    slices.append(ds)
-                except Exception as e:
-                    logger.warning(f"Invalid DICOM file {f}: {e}")
-                    continue
-            if not slices:
-                raise HTTPException(status_code=400, detail="No valid DICOM slices found.")
-            try:
-                slices.sort(key=lambda s: int(getattr(s, 'InstanceNumber', 0)))
-            except Exception:
-                try:
-                    slices.sort(key=lambda s: float(getattr(s, 'SliceLocation', 0.0)))
-                except Exception:
-                    pass
-            img_shape = slices[0].pixel_array.shape
-            volume = np.stack([s.pixel_array for s in slices], axis=0)
-            if len(volume.shape) == 3:
-                session.nifti_data = volume
+        elif is_dicom_zip or is_dicom:
+            if is_dicom_zip:
+                dicom_dir = os.path.join(temp_dir, "dicom_series")
+                os.makedirs(dicom_dir, exist_ok=True)
+                def _extract_zip():
+                    with zipfile.ZipFile(temp_file_path, 'r') as zf:
+                        zf.extractall(dicom_dir)
+                await loop.run_in_executor(None, _extract_zip)
+                dicom_files = [os.path.join(dicom_dir, f) for f in os.listdir(dicom_dir) if f.lower().endswith('.dcm')]
+                if not dicom_files:
+                    raise HTTPException(status_code=400, detail="No DICOM files found in uploaded zip.")
             else:
-                raise HTTPException(status_code=400, detail=f"Unexpected DICOM volume shape: {volume.shape}")
+                dicom_dir = temp_dir
+                if '/' in file.filename or '\\' in file.filename:
+                    subfolder = os.path.dirname(os.path.join(temp_dir, file.filename))
+                    if os.path.exists(subfolder):
+                        dicom_dir = subfolder
+                dicom_files = [os.path.join(dicom_dir, f) for f in os.listdir(dicom_dir) if f.lower().endswith('.dcm')]
+                if not dicom_files:
+                    dicom_files = [temp_file_path]
+
+            volume = await loop.run_in_executor(None, _load_dicom_series, dicom_files)
+            session.nifti_data = volume
             session.nifti_affine = None
             session.nifti_header = None
             session.nifti_file_path = dicom_dir
-            logger.info(f"DICOM series loaded: {len(slices)} slices, shape: {session.nifti_data.shape}")
-            logger.info(f"DICOM pixel value range: {session.nifti_data.min()} to {session.nifti_data.max()}")
+            session.file_uploaded = True
+            dmin, dmax = float(volume.min()), float(volume.max())
+            session.nifti_min, session.nifti_max = dmin, dmax
+            session.nifti_shape = tuple(volume.shape)
+            logger.info("DICOM series loaded: %d slices, shape: %s", volume.shape[0], volume.shape)
+            logger.info("DICOM pixel value range: %s to %s", dmin, dmax)
             return {
                 "message": "DICOM series uploaded and loaded successfully",
                 "session_id": session.session_id,
-                "shape": list(session.nifti_data.shape),
-                "data_range": [float(session.nifti_data.min()), float(session.nifti_data.max())],
-                "file_type": "dicom"
-            }
-
-        elif is_dicom:
-            dicom_file_path = temp_file_path
-            dicom_dir = temp_dir
-            if '/' in file.filename or '\\' in file.filename:
-                subfolder = os.path.dirname(os.path.join(temp_dir, file.filename))
-                if os.path.exists(subfolder):
-                    dicom_dir = subfolder
-            dicom_files = [os.path.join(dicom_dir, f) for f in os.listdir(dicom_dir) if f.lower().endswith('.dcm')]
-            if not dicom_files:
-                dicom_files = [dicom_file_path]
-            slices = []
-            for f in dicom_files:
-                try:
-                    ds = pydicom.dcmread(f)
-                    slices.append(ds)
-                except Exception as e:
-                    logger.warning(f"Invalid DICOM file {f}: {e}")
-                    continue
-            if not slices:
-                raise HTTPException(status_code=400, detail="No valid DICOM slices found.")
-            try:
-                slices.sort(key=lambda s: int(getattr(s, 'InstanceNumber', 0)))
-            except Exception:
-                try:
-                    slices.sort(key=lambda s: float(getattr(s, 'SliceLocation', 0.0)))
-                except Exception:
-                    pass
-            img_shape = slices[0].pixel_array.shape
-            volume = np.stack([s.pixel_array for s in slices], axis=0)
-            if len(volume.shape) == 3:
-                session.nifti_data = volume
-            else:
-                raise HTTPException(status_code=400, detail=f"Unexpected DICOM volume shape: {volume.shape}")
-            session.nifti_affine = None
-            session.nifti_header = None
-            session.nifti_file_path = dicom_dir
-            logger.info(f"DICOM series loaded: {len(slices)} slices, shape: {session.nifti_data.shape}")
-            logger.info(f"DICOM pixel value range: {session.nifti_data.min()} to {session.nifti_data.max()}")
-            return {
-                "message": "DICOM series uploaded and loaded successfully",
-                "session_id": session.session_id,
-                "shape": list(session.nifti_data.shape),
-                "data_range": [float(session.nifti_data.min()), float(session.nifti_data.max())],
+                "shape": list(volume.shape),
+                "data_range": [dmin, dmax],
                 "file_type": "dicom"
             }
 
@@ -534,158 +935,284 @@ async def upload_nifti(file: UploadFile = File(...), session: SessionState = Dep
         logger.error(f"Failed to load file: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to load file: {str(e)}")
 
+def _encode_slice(session: SessionState, axis: int, slice_index: int, use_scratch: bool = True) -> bytes:
+    """Normalize one slice and PNG-encode it, going through the session LRU cache.
+
+    Prefetch workers pass use_scratch=False so they allocate their own buffers
+    instead of racing the request thread for the shared scratch pool.
+    """
+    png_bytes = session.get_cached_slice(axis, slice_index)
+    if png_bytes is not None:
+        return png_bytes
+
+    generation = session.data_generation
+    slice_data = get_slice_data(session, axis, slice_index)
+    if use_scratch:
+        normalized_slice = normalize_slice_for_display(
+            slice_data,
+            buf_f32=session.get_scratch('f32', slice_data.shape, np.float32),
+            out=session.get_scratch('u8', slice_data.shape, np.uint8)
+        )
+    else:
+        normalized_slice = normalize_slice_for_display(slice_data)
+    png_bytes = encode_slice_png(normalized_slice)
+    session.cache_slice(axis, slice_index, png_bytes, generation)
+    return png_bytes
+
+def _consume_prefetch_result(future):
+    """Retrieve prefetch worker exceptions so asyncio doesn't log them as unretrieved
+
+    A prefetch racing a concurrent upload's clear_data can legitimately fail
+    (the volume it was encoding is gone); that's harmless, so just log it.
+    """
+    exc = future.exception()
+    if exc is not None:
+        logger.debug("Slice prefetch failed: %s", exc)
+
+def _prefetch_adjacent_slices(session: SessionState, axis: int, slice_index: int, max_slices: int):
+    """Warm the slice cache for the neighbours the user is likely to scrub to next"""
+    loop = asyncio.get_running_loop()
+    for neighbour in (slice_index - 1, slice_index + 1):
+        if 0 <= neighbour < max_slices and session.get_cached_slice(axis, neighbour) is None:
+            future = loop.run_in_executor(None, _encode_slice, session, axis, neighbour, False)
+            future.add_done_callback(_consume_prefetch_result)
+
+def validate_slice_request(session: SessionState, axis: int, slice_index: int) -> int:
+    """Validate axis/slice parameters, returning the slice count for the axis"""
+    if session.nifti_data is None:
+        raise HTTPException(status_code=400, detail="No NIfTI file loaded")
+
+    if axis not in [0, 1, 2]:
+        raise HTTPException(status_code=400, detail="Axis must be 0, 1, or 2")
+
+    max_slices = session.nifti_data.shape[axis]
+    if slice_index < 0 or slice_index >= max_slices:
+        raise HTTPException(status_code=400, detail=f"Slice index must be 0-{max_slices-1}")
+    return max_slices
+
+def get_marked_points_for_slice(session: SessionState, axis: int, slice_index: int) -> List[Point2DWithNumber]:
+    """Get marked points on a slice, filling in missing color info"""
+    slice_points = session.points_by_slice.get((axis, slice_index))
+    if not slice_points:
+        return []
+    marked_points = list(slice_points.values())
+    for point in marked_points:
+        if point.color is None:
+            point.color = session.get_point_color(point.point_number)
+    return marked_points
+
 @app.get("/api/slice/{axis}/{slice_index}")
-async def get_slice(axis: int, slice_index: int, session: SessionState = Depends(get_session)) -> SliceResponse:
-    """Get slice data for display"""
+async def get_slice(axis: int, slice_index: int, session: SessionState = Depends(get_session)):
+    """Get slice image as PNG (marked points and slice count ride along in headers)"""
     try:
-        if session.nifti_data is None:
-            raise HTTPException(status_code=400, detail="No NIfTI file loaded")
-        
-        # Validate parameters
-        if axis not in [0, 1, 2]:
-            raise HTTPException(status_code=400, detail="Axis must be 0, 1, or 2")
-        
-        max_slices = session.nifti_data.shape[axis]
-        if slice_index < 0 or slice_index >= max_slices:
-            raise HTTPException(status_code=400, detail=f"Slice index must be 0-{max_slices-1}")
-        
+        max_slices = validate_slice_request(session, axis, slice_index)
+
         # Update current view state
         session.current_axis = axis
         session.current_slice = slice_index
         session.update_activity()
-        
-        # Get slice data
-        slice_data = get_slice_data(session, axis, slice_index)
-        normalized_slice = normalize_slice_for_display(slice_data)
-        
-        # Get marked points for this slice
-        slice_key = (axis, slice_index)
-        marked_points = session.marked_points_2d.get(slice_key, [])
-        
-        # Ensure all points have color information
-        for point in marked_points:
-            if point.color is None:
-                point.color = session.get_point_color(point.point_number)
-        
+
+        # Get slice data and encode as PNG - one vectorized encode instead of
+        # serializing H*W Python ints through JSON
+        png_bytes = _encode_slice(session, axis, slice_index)
+        _prefetch_adjacent_slices(session, axis, slice_index, max_slices)
+
+        marked_points = get_marked_points_for_slice(session, axis, slice_index)
+
+        return Response(
+            content=png_bytes,
+            media_type="image/png",
+            headers={
+                "X-Max-Slices": str(max_slices),
+                "X-Marked-Points": json.dumps([p.dict() for p in marked_points])
+            }
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get slice: {str(e)}")
+
+@app.websocket("/ws/slices")
+async def stream_slices(websocket: WebSocket, session_id: str):
+    """Stream slice PNGs over one socket so scrubbing avoids per-slice HTTP round-trips
+
+    The client sends {"axis": int, "slice_index": int} messages and receives
+    two frames per request on the same connection: a JSON metadata frame
+    (mirroring the HTTP response headers) followed by the PNG bytes.
+    """
+    try:
+        session = session_manager.get_session(session_id)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            message = await websocket.receive_json()
+            axis = message.get("axis", 2)
+            slice_index = message.get("slice_index", 0)
+            try:
+                max_slices = validate_slice_request(session, axis, slice_index)
+            except HTTPException as e:
+                await websocket.send_json({"error": e.detail})
+                continue
+
+            session.current_axis = axis
+            session.current_slice = slice_index
+            session.update_activity()
+
+            # use_scratch=False: this runs on an executor thread, and the
+            # per-session scratch buffers belong to the event-loop get_slice
+            # path - sharing them here could tear a concurrently encoded PNG
+            png_bytes = await loop.run_in_executor(
+                None, _encode_slice, session, axis, slice_index, False
+            )
+            marked_points = get_marked_points_for_slice(session, axis, slice_index)
+            await websocket.send_json({
+                "axis": axis,
+                "slice_index": slice_index,
+                "max_slices": max_slices,
+                "marked_points": [p.dict() for p in marked_points],
+            })
+            await websocket.send_bytes(png_bytes)
+            _prefetch_adjacent_slices(session, axis, slice_index, max_slices)
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/api/slice_meta/{axis}/{slice_index}")
+async def get_slice_meta(axis: int, slice_index: int, session: SessionState = Depends(get_session)) -> SliceResponse:
+    """Get slice metadata (marked points, slice count) without the image payload"""
+    try:
+        max_slices = validate_slice_request(session, axis, slice_index)
+        session.update_activity()
+
         return SliceResponse(
-            slice_data=normalized_slice.tolist(),
             axis=axis,
             slice_index=slice_index,
             max_slices=max_slices,
-            marked_points=marked_points
+            marked_points=get_marked_points_for_slice(session, axis, slice_index)
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get slice: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get slice metadata: {str(e)}")
 
-@app.post("/api/mark_point")
-async def mark_point(request: MarkPointRequest, session: SessionState = Depends(get_session)):
-    """Mark a point on a slice"""
-    try:
-        if session.nifti_data is None:
-            raise HTTPException(status_code=400, detail="No NIfTI file loaded")
-        
-        # Convert to 3D coordinates
-        point_3d = convert_2d_to_3d_coordinates(request.point, request.axis, request.slice_index)
-        point_3d_tuple = (point_3d.z, point_3d.y, point_3d.x)
-        
+def apply_point_mark(session: SessionState, request: MarkPointRequest) -> dict:
+    """Mark a single point in a session; shared by the single and batch endpoints"""
+    if session.nifti_data is None:
+        raise HTTPException(status_code=400, detail="No NIfTI file loaded")
+
+    # Convert to 3D coordinates
+    point_3d = convert_2d_to_3d_coordinates(request.point, request.axis, request.slice_index)
+    point_3d_tuple = (point_3d.z, point_3d.y, point_3d.x)
+
+    with session.lock:
         # Handle specific point number request
         if request.point_number is not None:
             point_number = request.point_number
-            
+
             # Remove existing point with this number if it exists
-            if point_number in session.point_to_number.values():
-                # Find and remove the old point
-                old_point_tuple = None
-                for pt_tuple, pt_num in session.point_to_number.items():
-                    if pt_num == point_number:
-                        old_point_tuple = pt_tuple
-                        break
-                
-                if old_point_tuple:
-                    # Remove from point_to_number mapping
-                    del session.point_to_number[old_point_tuple]
-                    
-                    # Remove from all_3d_points
-                    session.all_3d_points = [p for p in session.all_3d_points 
-                                            if (p.z, p.y, p.x) != old_point_tuple]
-                    
-                    # Remove from all slice markings
-                    for slice_key in list(session.marked_points_2d.keys()):
-                        session.marked_points_2d[slice_key] = [
-                            p for p in session.marked_points_2d[slice_key] 
-                            if p.point_number != point_number
-                        ]
-            
+            old_point_tuple = session.number_to_point_tuple.get(point_number)
+            if old_point_tuple is not None:
+                del session.point_to_number[old_point_tuple]
+                session.all_3d_points.pop(old_point_tuple, None)
+                session.remove_point_markings(point_number)
+
             # Add new point with specific number
-            session.all_3d_points.append(point_3d)
+            session.all_3d_points[point_3d_tuple] = point_3d
             session.point_to_number[point_3d_tuple] = point_number
-            
+            session.number_to_point_tuple[point_number] = point_3d_tuple
+
             # Update counter if necessary
             if point_number > session.point_counter:
                 session.point_counter = point_number
-                
+
         else:
             # Normal sequential point marking - find next available number
             if point_3d_tuple not in session.point_to_number:
                 # New point - assign next available number
                 next_number = session.get_next_available_point_number()
-                session.all_3d_points.append(point_3d)
+                session.all_3d_points[point_3d_tuple] = point_3d
                 session.point_to_number[point_3d_tuple] = next_number
-                
+                session.number_to_point_tuple[next_number] = point_3d_tuple
+
                 # Update counter to highest used number
                 if next_number > session.point_counter:
                     session.point_counter = next_number
-                
-                logger.info(f"Point {next_number} marked: 2D({request.point.x}, {request.point.y}) -> 3D{point_3d_tuple} (Session: {session.session_id})")
-            
+
+                # %-formatting so the interpolation only happens if INFO is on
+                logger.info("Point %d marked: 2D(%d, %d) -> 3D%s (Session: %s)",
+                            next_number, request.point.x, request.point.y,
+                            point_3d_tuple, session.session_id)
+
             # Get the point number
             point_number = session.point_to_number[point_3d_tuple]
-        
-        # Add to slice points with number
+
+        # Add to slice points with number (replaces any existing point with
+        # the same number on this slice - O(1) dict insert)
         slice_key = (request.axis, request.slice_index)
-        if slice_key not in session.marked_points_2d:
-            session.marked_points_2d[slice_key] = []
-        
-        # Remove any existing point with same number on this slice
-        session.marked_points_2d[slice_key] = [
-            p for p in session.marked_points_2d[slice_key] 
-            if p.point_number != point_number
-        ]
-        
-        # Add the new point
         point_color = session.get_point_color(point_number)
         point_with_number = Point2DWithNumber(
-            x=request.point.x, 
-            y=request.point.y, 
+            x=request.point.x,
+            y=request.point.y,
             point_number=point_number,
             color=point_color
         )
-        session.marked_points_2d[slice_key].append(point_with_number)
-        
+        session.add_point_marking(slice_key, point_with_number)
+
         # Update the last marked number to track chronological order
         session.last_marked_number = point_number
-        
-        return {
-            "message": "Point marked successfully",
-            "point_number": point_number,
-            "total_points": len(session.all_3d_points),
-            "session_id": session.session_id
-        }
-        
+
+    return {
+        "message": "Point marked successfully",
+        "point_number": point_number,
+        "total_points": len(session.all_3d_points),
+        "session_id": session.session_id
+    }
+
+@app.post("/api/mark_point")
+async def mark_point(request: MarkPointRequest, session: SessionState = Depends(get_session)):
+    """Mark a point on a slice"""
+    try:
+        return apply_point_mark(session, request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to mark point: {str(e)}")
 
+@app.post("/api/mark_points_batch")
+async def mark_points_batch(request: MarkPointsBatchRequest):
+    """Mark points across sessions in one request
+
+    Each entry names its own session, so a client driving several sessions
+    can coalesce what would be N mark_point round trips into one.
+    """
+    try:
+        results = []
+        for entry in request.points:
+            session = get_session(entry.session_id)
+            results.append(apply_point_mark(session, entry))
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to mark points: {str(e)}")
+
 @app.delete("/api/points")
 async def clear_points(session: SessionState = Depends(get_session)):
     """Clear all marked points"""
-    session.marked_points_2d.clear()
-    session.all_3d_points.clear()
-    session.point_counter = 0
-    session.point_to_number.clear()
-    session.last_marked_number = 0  # Reset last marked number
+    with session.lock:
+        session.points_by_slice.clear()
+        session.number_to_slices.clear()
+        session.all_3d_points.clear()
+        session.point_counter = 0
+        session.point_to_number.clear()
+        session.number_to_point_tuple.clear()
+        session.last_marked_number = 0  # Reset last marked number
     
     return {
         "message": "All points cleared",
@@ -695,23 +1222,36 @@ async def clear_points(session: SessionState = Depends(get_session)):
 @app.get("/api/points")
 async def get_points(session: SessionState = Depends(get_session)):
     """Get all marked points"""
-    # Create a list of all points with their numbers and coordinates
+    # Gather the numbered points, then look up every color in one fancy-index
+    # of the LUT instead of a per-point get_point_color call
+    numbered = [
+        (session.point_to_number[point_tuple], point_3d)
+        for point_tuple, point_3d in session.all_3d_points.items()
+        if point_tuple in session.point_to_number
+    ]
     all_points_list = []
-    for point_3d in session.all_3d_points:
-        point_tuple = (point_3d.z, point_3d.y, point_3d.x)
-        point_number = session.point_to_number.get(point_tuple)
-        if point_number:
-            point_color = session.get_point_color(point_number)
+    if numbered:
+        numbers = np.fromiter((n for n, _ in numbered), dtype=np.int64, count=len(numbered))
+        colors = _COLOR_LUT[np.clip(numbers - 1, 0, len(_COLOR_LUT) - 1)]
+        colors[numbers > len(_COLOR_LUT)] = 255  # default for points beyond the template
+        for (point_number, point_3d), (r, g, b) in zip(numbered, colors.tolist()):
             all_points_list.append({
                 "point_number": point_number,
                 "coordinates": {"x": point_3d.x, "y": point_3d.y, "z": point_3d.z},
-                "color": point_color
+                "color": {"r": r, "g": g, "b": b}
             })
-    
+
+
     return {
         "points": all_points_list,
-        "points_2d": {f"{k[0]}_{k[1]}": v for k, v in session.marked_points_2d.items()},
-        "points_3d": session.all_3d_points,
+        # List of per-slice records instead of "axis_slice" string keys - orjson
+        # serializes this directly without per-entry string formatting
+        "points_2d": [
+            {"axis": k[0], "slice": k[1], "points": list(v.values())}
+            for k, v in session.points_by_slice.items()
+        ],
+        # Boundary conversion: internal _P3 tuples -> JSON objects
+        "points_3d": [{"z": p.z, "y": p.y, "x": p.x} for p in session.all_3d_points.values()],
         "total_points": len(session.all_3d_points),
         "session_id": session.session_id
     }
@@ -720,33 +1260,19 @@ async def get_points(session: SessionState = Depends(get_session)):
 async def remove_point(point_number: int, session: SessionState = Depends(get_session)):
     """Remove a specific point by its number"""
     try:
-        # Find the point tuple with this number
-        point_tuple_to_remove = None
-        for pt_tuple, pt_num in session.point_to_number.items():
-            if pt_num == point_number:
-                point_tuple_to_remove = pt_tuple
-                break
-        
-        if point_tuple_to_remove is None:
-            raise HTTPException(status_code=404, detail=f"Point {point_number} not found")
-        
-        # Remove from point_to_number mapping
-        del session.point_to_number[point_tuple_to_remove]
-        
-        # Remove from all_3d_points
-        session.all_3d_points = [p for p in session.all_3d_points 
-                                if (p.z, p.y, p.x) != point_tuple_to_remove]
-        
-        # Remove from all slice markings
-        for slice_key in list(session.marked_points_2d.keys()):
-            session.marked_points_2d[slice_key] = [
-                p for p in session.marked_points_2d[slice_key] 
-                if p.point_number != point_number
-            ]
-            # Remove empty slice entries
-            if not session.marked_points_2d[slice_key]:
-                del session.marked_points_2d[slice_key]
-        
+        with session.lock:
+            # Find the point tuple with this number - O(1) reverse lookup
+            point_tuple_to_remove = session.number_to_point_tuple.pop(point_number, None)
+            if point_tuple_to_remove is None:
+                raise HTTPException(status_code=404, detail=f"Point {point_number} not found")
+
+            # Remove from point_to_number mapping and the 3D point store
+            del session.point_to_number[point_tuple_to_remove]
+            session.all_3d_points.pop(point_tuple_to_remove, None)
+
+            # Remove from only the slices this number is marked on
+            session.remove_point_markings(point_number)
+
         logger.info(f"Point {point_number} removed (Session: {session.session_id})")
         
         return {
@@ -808,87 +1334,143 @@ def initialize_nn_session(session: SessionState):
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
+def _part1by2(n: int) -> int:
+    """Spread the low 10 bits of n so consecutive bits land 3 apart"""
+    n &= 0x3FF
+    n = (n | (n << 16)) & 0x30000FF
+    n = (n | (n << 8)) & 0x300F00F
+    n = (n | (n << 4)) & 0x30C30C3
+    n = (n | (n << 2)) & 0x9249249
+    return n
+
+def morton3(z: int, y: int, x: int) -> int:
+    """Interleave coordinate bits into a Morton (Z-order) code.
+
+    Sorting seeds by this code makes spatially close points consecutive, so
+    the subvolumes the segmentation loops touch stay hot in cache.
+    """
+    return (_part1by2(z) << 2) | (_part1by2(y) << 1) | _part1by2(x)
+
 def run_mock_segmentation(session: SessionState):
     """Run mock segmentation for testing"""
-    logger.info(f"Running mock segmentation with {len(session.all_3d_points)} points for session {session.session_id}...")
-    logger.info(f"NIfTI data shape: {session.nifti_data.shape}")
-    logger.info(f"NIfTI data range: {session.nifti_data.min():.2f} to {session.nifti_data.max():.2f}")
-    
-    # Initialize segmentation volume
-    mock_segmentation = np.zeros_like(session.nifti_data, dtype=np.uint8)
-    
-    for point_3d in session.all_3d_points:
-        # Use the actual point number as the label
-        point_tuple = (point_3d.z, point_3d.y, point_3d.x)
-        segment_label = session.point_to_number.get(point_tuple)
-        z, y, x = point_3d.z, point_3d.y, point_3d.x
-        logger.info(f"Processing point {segment_label}/{len(session.all_3d_points)}: ({z}, {y}, {x})")
-        
-        # Define region around point
+    n_points = len(session.all_3d_points)
+    data = session.nifti_data
+    logger.info("Running mock segmentation with %d points for session %s...", n_points, session.session_id)
+    logger.info("NIfTI data shape: %s", data.shape)
+
+    # Initialize segmentation volume, reusing the session's buffer when the
+    # shape still matches (fill is cheaper than malloc + first-touch faults)
+    if session.mock_seg_buffer is None or session.mock_seg_buffer.shape != data.shape:
+        session.mock_seg_buffer = np.zeros(data.shape, dtype=np.uint8)
+    else:
+        session.mock_seg_buffer.fill(0)
+    mock_segmentation = session.mock_seg_buffer
+
+    if SKIMAGE_AVAILABLE:
+        # One C-level seeded watershed call segments every tooth at once,
+        # with boundaries between adjacent seeds decided by intensity rather
+        # than first-wins claiming
+        seeds = np.zeros(data.shape, dtype=np.int32)
+        for point_tuple, segment_label in session.point_to_number.items():
+            seeds[point_tuple] = segment_label
+        bone_mask = data > 300
+        mock_segmentation[...] = watershed(-data, markers=seeds, mask=bone_mask)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Mock segmentation completed: %d total voxels segmented, %d unique labels",
+                        np.count_nonzero(mock_segmentation),
+                        len(np.unique(mock_segmentation[mock_segmentation > 0])))
+        return mock_segmentation
+
+    # Stack coordinates once and compute every region's clipped bounds in a
+    # couple of vectorized calls instead of six min/max per point. Points are
+    # processed in Morton order so spatially close seeds run back to back and
+    # reuse each other's cache lines; labels are pre-assigned, so the visible
+    # label of every region is unchanged.
+    pts = np.array([(p.z, p.y, p.x) for p in session.all_3d_points.values()], dtype=np.int32)
+    labels = np.fromiter(
+        (session.point_to_number[(p.z, p.y, p.x)] for p in session.all_3d_points.values()),
+        dtype=np.int64, count=n_points)
+    codes = np.fromiter((morton3(z, y, x) for z, y, x in pts.tolist()),
+                        dtype=np.int64, count=n_points)
+    order = np.argsort(codes, kind='stable')
+    pts = pts[order]
+    labels = labels[order]
+
+    hu_hi = float(np.iinfo(np.int16).max)
+    region_budget = 32768
+
+    if NUMBA_AVAILABLE:
+        # All seeds grow together from one shared breadth-first frontier,
+        # each bounded by a per-seed voxel budget (which replaces the fixed
+        # cube as the growth bound), so adjacent teeth inside one connected
+        # bone component split it between them instead of whichever seed
+        # runs first claiming the whole component. Availability lives in a
+        # packed bitmap (1 bit/voxel, all set) read by the kernel in place
+        # of the 8x larger label volume.
+        center_hu = data[pts[:, 0], pts[:, 1], pts[:, 2]].astype(np.float64)
+        hu_los = np.maximum(300.0, center_hu * 0.7)
+        grow_queue = np.empty((n_points * region_budget, 4), dtype=np.int32)
+        avail_bits = np.full((data.size + 7) >> 3, 0xFF, dtype=np.uint8)
+        _region_grow_multi(data, mock_segmentation, avail_bits, pts, hu_los,
+                           hu_hi, labels, grow_queue, region_budget)
+    else:
         radius = 12
-        z_min, z_max = max(0, z-radius), min(session.nifti_data.shape[0], z+radius)
-        y_min, y_max = max(0, y-radius), min(session.nifti_data.shape[1], y+radius)
-        x_min, x_max = max(0, x-radius), min(session.nifti_data.shape[2], x+radius)
-        
-        logger.info(f"  Region bounds: z[{z_min}:{z_max}], y[{y_min}:{y_max}], x[{x_min}:{x_max}]")
-        
-        # Extract region and create mask
-        region = session.nifti_data[z_min:z_max, y_min:y_max, x_min:x_max]
-        center_hu = session.nifti_data[z, y, x]
-        threshold = max(300, center_hu * 0.7)
-        
-        logger.info(f"  Center HU value: {center_hu:.2f}, Threshold: {threshold:.2f}")
-        
-        tooth_mask = region > threshold
-        existing_mask = mock_segmentation[z_min:z_max, y_min:y_max, x_min:x_max] == 0
-        final_mask = tooth_mask & existing_mask
-        
-        voxels_above_threshold = np.sum(tooth_mask)
-        voxels_available = np.sum(existing_mask)
-        voxels_segmented = np.sum(final_mask)
-        
-        logger.info(f"  Voxels above threshold: {voxels_above_threshold}")
-        logger.info(f"  Available voxels: {voxels_available}")
-        logger.info(f"  Final segmented voxels: {voxels_segmented}")
-        
-        mock_segmentation[z_min:z_max, y_min:y_max, x_min:x_max][final_mask] = segment_label
-    
-    total_segmented = np.sum(mock_segmentation > 0)
-    unique_labels = np.unique(mock_segmentation[mock_segmentation > 0])
-    logger.info(f"Mock segmentation completed: {total_segmented} total voxels segmented, {len(unique_labels)} unique labels")
-    
+        lo = np.clip(pts - radius, 0, None)
+        hi = np.minimum(pts + radius, np.array(data.shape, dtype=np.int32))
+
+        for (z, y, x), (z0, y0, x0), (z1, y1, x1), segment_label in zip(
+                pts.tolist(), lo.tolist(), hi.tolist(), labels.tolist()):
+            center_hu = data[z, y, x]
+            threshold = max(300, center_hu * 0.7)
+            region = data[z0:z1, y0:y1, x0:x1]
+            seg_view = mock_segmentation[z0:z1, y0:y1, x0:x1]
+            final_mask = (region > threshold) & (seg_view == 0)
+            seg_view[final_mask] = segment_label
+
+    # These reductions exist purely for the log line, so skip the volume
+    # passes entirely when INFO logging is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Mock segmentation completed: %d total voxels segmented, %d unique labels",
+                    np.count_nonzero(mock_segmentation),
+                    len(np.unique(mock_segmentation[mock_segmentation > 0])))
+
     return mock_segmentation
 
-def create_label_file(session: SessionState, output_path: str, segmentation: np.ndarray):
-    """Create ITK-SNAP compatible label file"""
-    unique_labels = np.unique(segmentation)
-    unique_labels = unique_labels[unique_labels > 0]
-    
+def create_label_file(session: SessionState, output_path: str, unique_labels: np.ndarray):
+    """Create ITK-SNAP compatible label file.
+
+    Takes the unique labels already computed by the caller so the volume is
+    not rescanned, and assembles the file as one buffered write.
+    """
     label_file_path = output_path.replace('.nii.gz', '_labels.txt')
-    
-    with open(label_file_path, 'w') as f:
-        f.write("################################################\n")
-        f.write("# ITK-SnAP Label Description File\n")
-        f.write("# Generated by Interactive 3D Segmentation Tool\n")
-        f.write("################################################\n")
-        f.write("# IDX   -R-  -G-  -B-  -A--  VIS MSH  LABEL\n")
-        f.write("################################################\n")
-        
+
+    lines = [
+        "################################################\n",
+        "# ITK-SnAP Label Description File\n",
+        "# Generated by Interactive 3D Segmentation Tool\n",
+        "################################################\n",
+        "# IDX   -R-  -G-  -B-  -A--  VIS MSH  LABEL\n",
+        "################################################\n",
         # Background
-        f.write(f"    0     0    0    0        0  0  0    \"Clear Label\"\n")
-        
-        # Segments
-        for label in sorted(unique_labels):
-            if label <= len(session.color_template):
-                color = session.color_template[label - 1]
-                r, g, b = color['r'], color['g'], color['b']
-                label_name = color['label']
-            else:
-                r, g, b = 255, 255, 255
-                label_name = f"#{label}"
-            
-            f.write(f"  {label:3d}  {r:3d}  {g:3d}  {b:3d}        1  1  1    \"{label_name}\"\n")
-    
+        "    0     0    0    0        0  0  0    \"Clear Label\"\n",
+    ]
+
+    # Segments - index the module RGB table and name list directly instead
+    # of unpacking per-label dicts
+    for label in sorted(unique_labels.tolist()):
+        if label <= len(_LABELS):
+            r, g, b = _COLOR_LUT[label - 1].tolist()
+            label_name = _LABELS[label - 1]
+        else:
+            r, g, b = 255, 255, 255
+            label_name = f"#{label}"
+
+        lines.append(f"  {label:3d}  {r:3d}  {g:3d}  {b:3d}        1  1  1    \"{label_name}\"\n")
+
+    with open(label_file_path, 'w') as f:
+        f.write("".join(lines))
+
     return label_file_path
 
 @app.post("/api/run_segmentation")
@@ -901,126 +1483,151 @@ async def run_segmentation(session: SessionState = Depends(get_session)) -> Segm
         if session.nifti_data is None:
             raise HTTPException(status_code=400, detail="No NIfTI file loaded")
         
-        logger.info(f"Running segmentation with {len(session.all_3d_points)} points for session {session.session_id}...")
-        logger.info(f"NNINTERACTIVE_AVAILABLE: {NNINTERACTIVE_AVAILABLE}")
-        logger.info(f"CUDA available: {torch.cuda.is_available() if torch else False}")
+        logger.info("Running segmentation with %d points for session %s...", len(session.all_3d_points), session.session_id)
+        logger.info("NNINTERACTIVE_AVAILABLE: %s", NNINTERACTIVE_AVAILABLE)
+        logger.info("CUDA available: %s", torch.cuda.is_available() if torch else False)
 
-        # Clear previous segmentation files to avoid confusion
-        for file_path in session.output_files:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    logger.info(f"Removed old segmentation file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Could not remove file {file_path}: {e}")
-        session.output_files.clear()
+        # No per-run cleanup needed: outputs live at fixed paths in the
+        # session's output directory and each run atomically replaces them
 
         # Try nnInteractive first (on GPU or CPU), fall back to mock
         segmentation = None
         method = "mock"
 
-        logger.info(f"Checking if nnInteractive is available and can be initialized...")
+        logger.info("Checking if nnInteractive is available and can be initialized...")
         if NNINTERACTIVE_AVAILABLE and initialize_nn_session(session):
-            logger.info(f"nnInteractive initialization successful, attempting segmentation...")
+            logger.info("nnInteractive initialization successful, attempting segmentation...")
             try:
                 method = "nnInteractive"
-                # Prepare image data
-                logger.info(f"Preparing image data for nnInteractive...")
-                nifti_data = session.nifti_data.astype(np.float32)
+                # Prepare image data - build the float32 copy once per upload
+                # rather than reallocating the full volume on every run
+                logger.info("Preparing image data for nnInteractive...")
+                if (session.nifti_data_f32 is None
+                        or session.nifti_data_f32.shape != session.nifti_data.shape):
+                    session.nifti_data_f32 = np.ascontiguousarray(session.nifti_data, dtype=np.float32)
+                nifti_data = session.nifti_data_f32
                 if nifti_data.ndim == 3:
                     image_4d = nifti_data[None]
                 else:
                     image_4d = nifti_data
-                logger.info(f"Image shape prepared: {image_4d.shape}")
-
-                # Initialize segmentation
-                combined_segmentation = np.zeros(image_4d.shape[1:], dtype=np.uint8)
-                logger.info(f"Processing {len(session.all_3d_points)} points with nnInteractive...")
-
-                # Process each point separately
-                for point_3d in session.all_3d_points:
+                logger.info("Image shape prepared: %s", image_4d.shape)
+
+                # Set the image once: set_image re-preprocesses/re-uploads the
+                # whole volume, so doing it per point is an O(N) full-volume
+                # transfer for no benefit
+                session.session.set_image(image_4d)
+
+                # Keep both buffers resident on the compute device and only
+                # copy the combined result back once after the loop. The
+                # combined buffer persists on the session between runs.
+                device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+                # Compare device types: a bare torch.device('cuda') never
+                # equals a tensor's concrete cuda:0 device, which would force
+                # a reallocation on every run
+                if (session.nn_combined_buffer is None
+                        or session.nn_combined_buffer.shape != image_4d.shape[1:]
+                        or session.nn_combined_buffer.device.type != device.type):
+                    session.nn_combined_buffer = torch.zeros(
+                        image_4d.shape[1:], dtype=torch.uint8, device=device)
+                else:
+                    session.nn_combined_buffer.zero_()
+                combined = session.nn_combined_buffer
+                target_buffer = torch.zeros_like(combined)
+                session.session.set_target_buffer(target_buffer)
+
+                n_points = len(session.all_3d_points)
+                logger.info("Processing %d points with nnInteractive...", n_points)
+
+                # Same Morton ordering as the mock path: neighbouring seeds
+                # keep their surrounding volume regions cache-resident
+                for point_3d in sorted(session.all_3d_points.values(),
+                                       key=lambda p: morton3(p.z, p.y, p.x)):
                     # Use the actual point number as the label
                     point_tuple = (point_3d.z, point_3d.y, point_3d.x)
                     segment_label = session.point_to_number.get(point_tuple)
-                    logger.info(f"Processing point {segment_label}/{len(session.all_3d_points)}: {point_3d}")
-
-                    # Set image and target buffer
-                    session.session.set_image(image_4d)
-                    target_buffer = torch.zeros(image_4d.shape[1:], dtype=torch.uint8)
-                    session.session.set_target_buffer(target_buffer)
-
-                    # Add point interaction
-                    point_tuple = (point_3d.z, point_3d.y, point_3d.x)
+                    logger.info("Processing point %s/%d: %s", segment_label, n_points, point_3d)
+
+                    # Reset the interaction memory so each point predicts an
+                    # independent object, as the per-point set_image used to;
+                    # the preprocessed image stays resident, so the one-upload
+                    # win is kept
+                    session.session.reset_interactions()
+                    target_buffer.zero_()
                     session.session.add_point_interaction(point_tuple, include_interaction=True)
 
-                    # Get segmentation
-                    point_segmentation = target_buffer.clone().cpu().numpy()
-                    mask = point_segmentation > 0
-                    available_mask = combined_segmentation == 0
-                    final_mask = mask & available_mask
+                    # First label to claim a voxel wins; stays on-device
+                    claim = (target_buffer > 0) & (combined == 0)
+                    combined[claim] = segment_label
 
-                    voxels_segmented = np.sum(final_mask)
-                    logger.info(f"Point {segment_label} segmented {voxels_segmented} voxels")
-
-                    combined_segmentation[final_mask] = segment_label
-
-                segmentation = combined_segmentation
-                logger.info(f"nnInteractive segmentation completed successfully")
+                if device.type == 'cuda':
+                    torch.cuda.synchronize()
+                segmentation = combined.cpu().numpy()
+                logger.info("nnInteractive segmentation completed successfully")
 
             except Exception as e:
-                logger.error(f"nnInteractive failed for session {session.session_id}: {e}, falling back to mock")
+                logger.error("nnInteractive failed for session %s: %s, falling back to mock", session.session_id, e)
                 method = "mock"
                 segmentation = None
         else:
-            logger.info(f"nnInteractive not available or initialization failed, using mock segmentation")
+            logger.info("nnInteractive not available or initialization failed, using mock segmentation")
 
         # Fall back to mock segmentation
         if segmentation is None:
-            logger.info(f"Starting mock segmentation...")
+            logger.info("Starting mock segmentation...")
             segmentation = run_mock_segmentation(session)
         
-        # Save results
-        logger.info(f"Saving segmentation results...")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = tempfile.mkdtemp()
-        output_path = os.path.join(output_dir, f"segmented_{timestamp}_{session.session_id[:8]}.nii.gz")
+        # Save results into the session's persistent output directory; each
+        # run overwrites the same well-known filename via an atomic replace
+        # instead of leaking a fresh temp directory
+        logger.info("Saving segmentation results...")
+        output_dir = session.get_output_dir()
+        output_path = os.path.join(output_dir, "segmentation.nii.gz")
 
-        logger.info(f"Output directory: {output_dir}")
-        logger.info(f"Output file path: {output_path}")
-
-        # Only apply flipping/transposing for DICOM folder input (not NIfTI)
-        seg_to_save = segmentation
-        if session.nifti_file_path and isinstance(session.nifti_file_path, str) and os.path.isdir(session.nifti_file_path):
-            # Transpose from (Z, Y, X) to (X, Y, Z)
-            seg_to_save = np.transpose(seg_to_save, (2, 1, 0))
-            # Flip along Z axis to make it right-side up (flip last axis)
-            seg_to_save = np.flip(seg_to_save, axis=2)
-            logger.info("Applied transpose and flip to segmentation output for DICOM folder upload.")
+        logger.info("Output directory: %s", output_dir)
+        logger.info("Output file path: %s", output_path)
 
         # Create NIfTI image with same affine and header if available, else identity
         affine = session.nifti_affine if session.nifti_affine is not None else np.eye(4)
+        # For DICOM folder input the output used to be transposed to (X, Y, Z)
+        # and flipped along Z, materializing a full copy of the volume. The
+        # same orientation is now encoded in the affine - voxel (z, y, x)
+        # maps to world (x, y, depth-1-z) - which consumers like ITK-SNAP
+        # apply from the header, so the voxel data is saved untouched.
+        if session.nifti_file_path and isinstance(session.nifti_file_path, str) and os.path.isdir(session.nifti_file_path):
+            depth = segmentation.shape[0]
+            affine = np.array([
+                [0.0, 0.0, 1.0, 0.0],
+                [0.0, 1.0, 0.0, 0.0],
+                [-1.0, 0.0, 0.0, float(depth - 1)],
+                [0.0, 0.0, 0.0, 1.0],
+            ])
+            logger.info("Encoded DICOM output orientation in the affine.")
+
         header = session.nifti_header if session.nifti_header is not None else None
-        segmentation_nii = nib.Nifti1Image(
-            seg_to_save.astype(np.uint8),
-            affine,
-            header
-        )
-        nib.save(segmentation_nii, output_path)
-        logger.info(f"Segmentation NIfTI file saved: {output_path}")
+        seg_to_save = segmentation if segmentation.dtype == np.uint8 else segmentation.astype(np.uint8)
+        segmentation_nii = nib.Nifti1Image(seg_to_save, affine, header)
+        tmp_path = os.path.join(output_dir, "segmentation.tmp.nii.gz")
+        # gzip-compressing a full volume takes seconds; keep it off the event
+        # loop so other sessions stay responsive during the save
+        await asyncio.to_thread(nib.save, segmentation_nii, tmp_path)
+        os.replace(tmp_path, output_path)
+        logger.info("Segmentation NIfTI file saved: %s", output_path)
         
-        # Create label file
-        label_file_path = create_label_file(session, output_path, segmentation)
-        logger.info(f"Label file created: {label_file_path}")
-        
-        # Store file paths for cleanup
-        session.output_files.extend([output_path, label_file_path])
-        
-        # Get statistics
+        # Scan for the unique labels once and share the result between the
+        # label file and the response statistics
         unique_labels = np.unique(segmentation[segmentation > 0])
-        
-        logger.info(f"Segmentation complete for session {session.session_id}: {len(unique_labels)} segments created using {method}")
-        logger.info(f"Unique labels: {unique_labels.tolist()}")
-        logger.info(f"Files available for download: {len(session.output_files)}")
+
+        # Create label file
+        label_file_path = create_label_file(session, output_path, unique_labels)
+        logger.info("Label file created: %s", label_file_path)
+
+        # Store file paths for cleanup and stat them once for downloads
+        session.output_files = [output_path, label_file_path]
+        session.output_stats = {p: os.stat(p) for p in (output_path, label_file_path)}
+
+        logger.info("Segmentation complete for session %s: %d segments created using %s", session.session_id, len(unique_labels), method)
+        logger.info("Unique labels: %s", unique_labels.tolist())
+        logger.info("Files available for download: %d", len(session.output_files))
         
         return SegmentationStatus(
             status="success",
@@ -1057,6 +1664,7 @@ async def download_file(file_type: str, session: SessionState = Depends(get_sess
                 path=latest_file,
                 media_type='application/octet-stream',
                 filename=original_filename,
+                stat_result=session.output_stats.get(latest_file),
                 headers={"Content-Disposition": f"attachment; filename=\"{original_filename}\""}
             )
     elif file_type == "labels":
@@ -1073,6 +1681,7 @@ async def download_file(file_type: str, session: SessionState = Depends(get_sess
                 path=latest_file,
                 media_type='text/plain',
                 filename=original_filename,
+                stat_result=session.output_stats.get(latest_file),
                 headers={"Content-Disposition": f"attachment; filename=\"{original_filename}\""}
             )
     
@@ -1081,13 +1690,14 @@ async def download_file(file_type: str, session: SessionState = Depends(get_sess
 @app.get("/api/status")
 async def get_status(session: SessionState = Depends(get_session)):
     """Get application status and session state"""
-    # Get file info if available
+    # Get file info if available - stats were cached at upload time, so a
+    # status poll never touches the volume itself
     file_info = None
-    if session.nifti_data is not None:
+    if session.file_uploaded:
         file_info = {
             "filename": os.path.basename(session.nifti_file_path) if session.nifti_file_path else "uploaded_file.nii.gz",
-            "shape": list(session.nifti_data.shape),
-            "data_range": [float(session.nifti_data.min()), float(session.nifti_data.max())]
+            "shape": list(session.nifti_shape),
+            "data_range": [session.nifti_min, session.nifti_max]
         }
     
     # Check if segmentation files exist
@@ -1095,7 +1705,7 @@ async def get_status(session: SessionState = Depends(get_session)):
     
     return {
         "session_id": session.session_id,
-        "file_uploaded": session.nifti_data is not None,
+        "file_uploaded": session.file_uploaded,
         "file_info": file_info,
         "total_points": len(session.all_3d_points),
         "current_axis": session.current_axis,
@@ -1122,7 +1732,7 @@ async def get_color_template(session_id: str = Header(None, alias="X-Session-ID"
         session = get_session(session_id)
         return {
             "status": "success",
-            "color_template": session.color_template,
+            "color_template": COLOR_TEMPLATE,
             "session_id": session.session_id
         }
     except HTTPException:
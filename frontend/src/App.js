@@ -114,6 +114,8 @@ function App() {
   const canvasRef = useRef(null);
   const fileInputRef = useRef(null);
   const sessionManagerRef = useRef(new SessionManager());
+  const sliceSocketRef = useRef(null);
+  const sliceMetaRef = useRef(null);
   
   const axisNames = ['Sagittal', 'Coronal', 'Axial'];
 
@@ -306,16 +308,27 @@ function App() {
     try {
       console.log('Making API call to:', `${API_BASE}/api/slice/${axis}/${sliceIndex}`);
       const response = await sessionManagerRef.current.apiCall(`${API_BASE}/api/slice/${axis}/${sliceIndex}`, {
-        method: 'GET'
+        method: 'GET',
+        responseType: 'blob'
       });
-      console.log('Slice data received:', response.data);
-      setSliceData(response.data);
-      setMarkedPoints(response.data.marked_points || []);
-      
+
+      // Slice image arrives as PNG; metadata rides along in response headers
+      const maxSlices = parseInt(response.headers['x-max-slices'], 10);
+      const points = JSON.parse(response.headers['x-marked-points'] || '[]');
+      const sliceMeta = {
+        axis,
+        slice_index: sliceIndex,
+        max_slices: maxSlices,
+        marked_points: points
+      };
+      setSliceData(sliceMeta);
+      setMarkedPoints(points);
+
       // Also fetch all points globally for the status table
       await fetchAllPoints();
-      
-      drawSlice(response.data.slice_data, response.data.marked_points || [], axis);
+
+      const sliceImage = await createImageBitmap(response.data);
+      drawSlice(sliceImage, points, axis);
     } catch (error) {
       console.error('Error loading slice:', error);
       setStatus({ 
@@ -361,33 +374,20 @@ function App() {
   };
   
   // Draw slice on canvas
-  const drawSlice = (data, points, axis = currentAxis) => {
+  const drawSlice = (image, points, axis = currentAxis) => {
     const canvas = canvasRef.current;
-    if (!canvas || !data) return;
+    if (!canvas || !image) return;
 
     const ctx = canvas.getContext('2d');
-    const height = data.length;
-    const width = data[0].length;
+    const height = image.height;
+    const width = image.width;
 
     // Set canvas size
     canvas.width = width;
     canvas.height = height;
 
-    // Create image data
-    const imageData = ctx.createImageData(width, height);
-
-    for (let y = 0; y < height; y++) {
-      for (let x = 0; x < width; x++) {
-        const value = data[y][x];
-        const index = (y * width + x) * 4;
-        imageData.data[index] = value;     // R
-        imageData.data[index + 1] = value; // G
-        imageData.data[index + 2] = value; // B
-        imageData.data[index + 3] = 255;   // A
-      }
-    }
-
-    ctx.putImageData(imageData, 0, 0);
+    // Draw the decoded PNG slice directly
+    ctx.drawImage(image, 0, 0);
 
     // --- START: Added code for orientation labels ---
     const orientationLabels = {
@@ -523,14 +523,67 @@ function App() {
     });
   };
   
+  // Slice streaming socket: scrubbing sends {axis, slice_index} over one
+  // WebSocket and gets a metadata frame plus the PNG bytes back, avoiding
+  // a full HTTP round-trip per slice step
+  const handleSliceFrame = async (event) => {
+    if (typeof event.data === 'string') {
+      const meta = JSON.parse(event.data);
+      if (meta.error) {
+        console.error('Slice stream error:', meta.error);
+        return;
+      }
+      sliceMetaRef.current = meta;
+      setSliceData(meta);
+      setMarkedPoints(meta.marked_points);
+    } else {
+      const meta = sliceMetaRef.current;
+      if (!meta) return;
+      const sliceImage = await createImageBitmap(event.data);
+      drawSlice(sliceImage, meta.marked_points, meta.axis);
+    }
+  };
+
+  const ensureSliceSocket = () => {
+    const existing = sliceSocketRef.current;
+    if (existing && (existing.readyState === WebSocket.OPEN ||
+                     existing.readyState === WebSocket.CONNECTING)) {
+      return existing;
+    }
+    const currentSessionId = sessionManagerRef.current.getCurrentSessionId();
+    if (!currentSessionId) return null;
+    const wsBase = (API_BASE || window.location.origin).replace(/^http/, 'ws');
+    const ws = new WebSocket(`${wsBase}/ws/slices?session_id=${currentSessionId}`);
+    ws.binaryType = 'blob';
+    ws.onmessage = handleSliceFrame;
+    ws.onclose = () => {
+      if (sliceSocketRef.current === ws) sliceSocketRef.current = null;
+    };
+    sliceSocketRef.current = ws;
+    return ws;
+  };
+
+  useEffect(() => {
+    return () => {
+      if (sliceSocketRef.current) sliceSocketRef.current.close();
+    };
+  }, []);
+
   // Navigation functions
   const changeSlice = (direction) => {
     if (!sliceData) return;
-    
+
     const newSlice = currentSlice + direction;
     if (newSlice >= 0 && newSlice < sliceData.max_slices) {
       setCurrentSlice(newSlice);
-      loadSlice(currentAxis, newSlice);
+      const ws = ensureSliceSocket();
+      if (ws && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ axis: currentAxis, slice_index: newSlice }));
+      } else {
+        // Socket still connecting (or unavailable): use HTTP for this step,
+        // subsequent scrubs ride the socket
+        loadSlice(currentAxis, newSlice);
+      }
     }
   };
   